@@ -1,22 +1,15 @@
 #!/usr/bin/env python3
 """an attempt to reconstruct my approach to merging P1225 duplicates, from IPython history"""
 
-import json
-
-with open('P1225_items_unpretty.json') as infile:
-    items = {}
-    for l in infile:
-        obj = json.loads(l)
-        items[obj['id']] = obj
+import orjson
 
 P1225_ids = {}
 
-for item in items:
-    usnai = items[item]['claims']['P1225'][0]['mainsnak']['datavalue']['value']
-    if usnai in P1225_ids:
-        P1225_ids[usnai].append(item)
-    else:
-        P1225_ids[usnai] = [item]
+with open('P1225_items_unpretty.json', 'rb') as infile:
+    for l in infile:
+        obj = orjson.loads(l)
+        usnai = obj['claims']['P1225'][0]['mainsnak']['datavalue']['value']
+        P1225_ids.setdefault(usnai, []).append(obj['id'])
 
 for i in P1225_ids:
     if len(P1225_ids[i]) > 1:
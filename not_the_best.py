@@ -1,20 +1,66 @@
 #!/usr/bin/env python3
 """look for promotional words in Wikidata descriptions"""
 
+import itertools
+import multiprocessing
 import sys
-import string
-import json
-
-# zcat latest-all.json.gz | ./not_the_best.py
-with sys.stdin as infile:
-    infile.readline()
-    to_skip = ('Q749290')
-    for line in infile:
-        obj = json.loads(line.rstrip(',\n'))
+
+import orjson
+
+# lines handed to each worker at a time
+chunk_size = 10000
+
+# frozenset for O(1) membership; the old ('Q749290') was actually a plain string
+to_skip = frozenset({'Q749290'})
+
+def scan_chunk(lines):
+    hits = []
+    for line in lines:
+        # cheap necessary-condition check on the raw bytes; parsing costs far more
+        if b'the best ' not in line:
+            continue
+        # no English description means no match; a stray "language":"en" later in
+        # the line just costs one wasted parse
+        dindex = line.find(b'"descriptions"')
+        if dindex == -1 or b'"language":"en"' not in line[dindex:]:
+            continue
+        obj = orjson.loads(line[:-2] if line.endswith(b',\n') else line)
         qid = obj['id']
         if qid not in to_skip and 'en' in obj['descriptions']:
             desc = obj['descriptions']['en']['value']
-            
+
             if 'the best ' in desc and 'award' not in desc:
-                print(qid, ' ' * (16 - len(qid)), desc)
+                hits.append((qid, desc))
+    return hits
+
+def chunked(iterable, size):
+    it = iter(iterable)
+    while chunk := list(itertools.islice(it, size)):
+        yield chunk
+
+# ./not_the_best.py latest-all.json.gz  (decompresses in-process across all cores)
+# or: zcat latest-all.json.gz | ./not_the_best.py
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        import os
+        try:
+            import rapidgzip
+            infile = rapidgzip.open(sys.argv[1], parallelization=os.cpu_count())
+        except ImportError:
+            # pigz still beats zcat's single-threaded inflate
+            import subprocess
+            infile = subprocess.Popen(['pigz', '-dc', sys.argv[1]],
+                                      stdout=subprocess.PIPE).stdout
+    else:
+        infile = sys.stdin.buffer
 
+    with infile:
+        infile.readline()
+        out = sys.stdout.buffer
+        try:
+            with multiprocessing.Pool() as pool:
+                for hits in pool.imap(scan_chunk, chunked(infile, chunk_size)):
+                    for qid, desc in hits:
+                        out.write(f'{qid:<18}{desc}\n'.encode())
+        finally:
+            out.flush()
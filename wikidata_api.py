@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""shared helpers for the Wikidata wbgetentities API"""
+
+import asyncio
+import shelve
+import time
+
+import aiohttp
+import requests
+
+API_ENDPOINT = 'https://www.wikidata.org/w/api.php'
+USER_AGENT = 'WikiMiscScripts/0.1 (https://www.wikidata.org/wiki/User:Jamie7687)'
+# the documented limit on how many items can be queried at once
+QUERY_LIMIT = 50
+# minimum seconds between requests; a token-bucket interval rather than a blanket sleep
+MIN_REQUEST_INTERVAL = 0.5
+# how many concurrent requests the async fetcher may have in flight, and the short
+# delay before each so the average rate stays polite
+ASYNC_CONCURRENCY = 4
+ASYNC_REQUEST_DELAY = 0.2
+
+# one session for the whole process, so TCP/TLS connections are reused across batches
+_session = requests.Session()
+_session.headers['User-Agent'] = USER_AGENT
+# prefer zstd/brotli when urllib3 has the codecs installed; decoding is handled by the
+# library, and both are noticeably faster to decompress than gzip
+_session.headers['Accept-Encoding'] = 'zstd, br, gzip, deflate'
+
+_last_request = 0.0
+
+def _throttle():
+    global _last_request
+    wait = _last_request + MIN_REQUEST_INTERVAL - time.monotonic()
+    if wait > 0:
+        time.sleep(wait)
+    _last_request = time.monotonic()
+
+def _fetch_entities(ids, params):
+    entities = {}
+    for i in range(0, len(ids), QUERY_LIMIT):
+        _throttle()
+        params['ids'] = '|'.join(ids[i:i+QUERY_LIMIT])
+        result_json = _session.get(API_ENDPOINT, params=params).json()
+        if result_json.get('success') != 1:
+            raise Exception('wbgetentities call failed')
+        entities.update(result_json['entities'])
+    return entities
+
+async def _fetch_batch_async(session, semaphore, params, batch):
+    async with semaphore:
+        await asyncio.sleep(ASYNC_REQUEST_DELAY)
+        async with session.get(API_ENDPOINT, params={**params, 'ids': '|'.join(batch)}) as result:
+            result_json = await result.json()
+    if result_json.get('success') != 1:
+        raise Exception('wbgetentities call failed')
+    return result_json['entities']
+
+async def _fetch_entities_async(ids, params):
+    semaphore = asyncio.Semaphore(ASYNC_CONCURRENCY)
+    async with aiohttp.ClientSession(headers={'User-Agent': USER_AGENT}) as session:
+        batches = [ids[i:i+QUERY_LIMIT] for i in range(0, len(ids), QUERY_LIMIT)]
+        results = await asyncio.gather(
+            *(_fetch_batch_async(session, semaphore, params, b) for b in batches))
+    entities = {}
+    for batch_entities in results:
+        entities.update(batch_entities)
+    return entities
+
+def _build_params(props, languages):
+    params = {'action': 'wbgetentities', 'format': 'json'}
+    if props:
+        params['props'] = '|'.join(props)
+    if languages:
+        params['languages'] = '|'.join(languages)
+    return params
+
+def _through_cache(ids, cache_path, fetch):
+    if cache_path is None:
+        return fetch(ids)
+    with shelve.open(cache_path) as cache:
+        missing = [q for q in ids if q not in cache]
+        for qid, entity in fetch(missing).items():
+            cache[qid] = entity
+        return {qid: cache[qid] for qid in ids if qid in cache}
+
+def get_entities(ids, props=None, languages=None, cache_path=None):
+    """fetch entities in batches of QUERY_LIMIT, returning one merged id->entity dict
+
+    props and languages narrow the response (e.g. props=('labels', 'descriptions'),
+    languages=('en',)) -- without them the API returns sitelinks, aliases and claims
+    for every language, which is usually 5-10x more data than needed.
+
+    cache_path names a shelve file storing one record per entity, so reruns only
+    fetch IDs they have not seen before. Entities are cached as returned, so use a
+    separate cache file per props/languages combination.
+    """
+    params = _build_params(props, languages)
+    return _through_cache(ids, cache_path, lambda missing: _fetch_entities(missing, params))
+
+def get_entities_concurrent(ids, props=None, languages=None, cache_path=None):
+    """like get_entities, but overlaps batch requests with aiohttp
+
+    Up to ASYNC_CONCURRENCY batches are in flight at once, so wall time is bounded
+    by the slowest batch rather than the sum of round trips.
+    """
+    params = _build_params(props, languages)
+    return _through_cache(
+        ids, cache_path,
+        lambda missing: asyncio.run(_fetch_entities_async(missing, params)))